@@ -38,8 +38,11 @@ def export_markdown_file(file_path, export_to_html=True, max_depth=None):
         print(f"Error: {error}")
         return None
     
+    # Share one directory index between counting and exporting so the vault is walked once
+    file_index = {}
+    
     # Count the expected number of files to be exported
-    expected_count, _ = count_expected_links(file_to_export, max_depth=max_depth)
+    expected_count, _ = count_expected_links(file_to_export, max_depth=max_depth, file_index=file_index)
     print(f"Expected to export {expected_count} files.")
     
     # Create an export directory
@@ -56,9 +59,9 @@ def export_markdown_file(file_path, export_to_html=True, max_depth=None):
     read_files_recursive(
         file_to_export, 
         max_depth=max_depth, 
-        export_to_html=export_to_html, 
         export_dir=export_dir, 
-        files_already_copied=files_copied
+        files_already_copied=files_copied,
+        file_index=file_index
     )
     
     print(f"Exported {len(files_copied)} files to {export_dir}")
@@ -2,107 +2,403 @@
 File Operations Module
 
 This module provides functions for file operations in the Markdown export process.
-Functions include finding and copying files, processing markdown links, and handling recursion.
+Functions include finding and copying files, processing markdown links, and traversing linked notes.
 """
 
+import mmap
 import os
 import re
 import shutil
-from pathlib import Path
+import sys
+from functools import lru_cache
+from concurrent.futures import ThreadPoolExecutor
 
-from .path_utils import ensure_str_path, find_file_in_directory
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from .path_utils import ensure_str_path, find_file_cached
+
+# Wiki-style links to notes ([[note]]) and embedded images (![[image.png]])
+_MD_LINK_RE = re.compile(r"(?<!!)\[\[([^\]]*)\]\]")
+_IMG_LINK_RE = re.compile(r"!\[\[([^\]]*)\]\]")
+# Both kinds at once, over the raw bytes of a note; group 1 is "!" for embeds and
+# empty for note links. Links never span lines, so whole-file matches agree with
+# per-line ones, and the syntax is ASCII, so only matched links need decoding.
+_LINK_BYTES_RE = re.compile(rb"(!?)\[\[([^\]\r\n]*)\]\]")
+
+# Notes at least this large are scanned through mmap instead of being read into memory
+_MMAP_THRESHOLD = 1024 * 1024
+
+# Copying and reading notes are I/O-bound, so use more threads than cores
+_COPY_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+_PARSE_WORKERS = _COPY_WORKERS
+
+# Linux ioctl that makes a copy-on-write clone of a file (btrfs, XFS, ...)
+_FICLONE = 0x40049409 if fcntl is not None and sys.platform.startswith("linux") else None
+
+# (source device, export directory) pairs where cloning failed; copied normally from then on
+_clone_unsupported = set()
+
+
+def _clone_file(source, dest_file, source_device):
+    """
+    Try to copy a file as a copy-on-write clone, which moves no file data.
+    
+    Hard links are deliberately not used: editing an exported note would then
+    edit the note in the vault as well.
+    
+    Args:
+        source (str): Path of the file to copy
+        dest_file (str): Destination path inside the export directory
+        source_device (int): st_dev of the source file
+        
+    Returns:
+        bool: True if the file was cloned, False if it still needs copying
+    """
+    clone_target = (source_device, os.path.dirname(dest_file))
+    if _FICLONE is None or clone_target in _clone_unsupported:
+        return False
+    
+    try:
+        with open(source, "rb") as source_file, open(dest_file, "wb") as dest:
+            try:
+                fcntl.ioctl(dest.fileno(), _FICLONE, source_file.fileno())
+            except OSError:
+                # Different filesystems or one without clones; don't try this pair again
+                _clone_unsupported.add(clone_target)
+                return False
+    except OSError:
+        # Let the regular copy report the error
+        return False
+    
+    return True
+
+
+def _copy_file(source, dest_file):
+    """
+    Copy a file into the export unless the destination is the source itself.
+    
+    On filesystems that support it the file is cloned rather than copied. The
+    copy is skipped when the destination is the source itself (e.g. a hard
+    link or an export into the vault).
+    
+    Args:
+        source (str): Path of the file to copy
+        dest_file (str): Destination path inside the export directory
+    """
+    try:
+        source_stat = os.stat(source)
+    except FileNotFoundError:
+        # Let the regular copy report the missing file
+        shutil.copyfile(source, dest_file)
+        return
+    
+    try:
+        dest_stat = os.stat(dest_file)
+    except FileNotFoundError:
+        pass
+    else:
+        if os.path.samestat(source_stat, dest_stat):
+            return
+    
+    if not _clone_file(source, dest_file, source_stat.st_dev):
+        shutil.copyfile(source, dest_file)
+
+
+def _run_copies(pending_copies):
+    """
+    Run deferred copies on a thread pool.
+    
+    Args:
+        pending_copies (dict): Destination-to-source map of deferred copies
+    """
+    # Create each destination directory once rather than before every copy
+    for dest_dir in {os.path.dirname(dest_file) for dest_file in pending_copies}:
+        os.makedirs(dest_dir, exist_ok=True)
+    
+    if len(pending_copies) <= 1:
+        for dest_file, source in pending_copies.items():
+            _copy_file(source, dest_file)
+        return
+    
+    with ThreadPoolExecutor(max_workers=min(_COPY_WORKERS, len(pending_copies))) as executor:
+        # Consume the results so any copy error is raised here
+        list(executor.map(_copy_file, pending_copies.values(), pending_copies.keys()))
+
+
+def _find_links(content):
+    """
+    Find the wiki-links in the raw bytes of a note.
+    
+    Args:
+        content (bytes or mmap.mmap): The note's contents
+        
+    Returns:
+        tuple: (is_image, link_text) pairs in the order they appear in the note
+    """
+    # Most notes without links can skip the regex entirely
+    if content.find(b"[[") == -1:
+        return ()
+    
+    return tuple(
+        (bool(is_image), file_link.decode('utf-8'))
+        for is_image, file_link in _LINK_BYTES_RE.findall(content)
+    )
+
+
+@lru_cache(maxsize=None)
+def _parse_links_cached(path, mtime_ns, size):
+    """
+    Read a note and return its wiki-links; cached by path and modification stamp.
+    
+    The cache is unbounded so that no note of a vault, however large, is read
+    twice in one export; run_export() clears it with clear_link_cache() first.
+    
+    Args:
+        path (str): Normalized path of the markdown file
+        mtime_ns (int): Modification time of the file, part of the cache key
+        size (int): Size of the file, part of the cache key
+        
+    Returns:
+        tuple: (is_image, link_text) pairs in the order they appear in the note
+    """
+    with open(path, "rb") as read_file:
+        if size >= _MMAP_THRESHOLD:
+            # Let the regex scan the page cache directly rather than a copy of the file
+            with mmap.mmap(read_file.fileno(), 0, access=mmap.ACCESS_READ) as content:
+                return _find_links(content)
+        return _find_links(read_file.read())
+
+
+def parse_links(path):
+    """
+    Return the wiki-links of a note, reading and parsing each file at most once.
+    
+    Results are shared between counting the links and exporting them. An edited
+    file gets a new modification stamp and is therefore parsed again.
+    
+    Args:
+        path (str): Path to the markdown file
+        
+    Returns:
+        tuple: (is_image, link_text) pairs in the order they appear in the note,
+            where link_text still includes any anchor or alias
+    """
+    path = os.path.normpath(ensure_str_path(path))
+    stat = os.stat(path)
+    return _parse_links_cached(path, stat.st_mtime_ns, stat.st_size)
+
+
+def _prefetch_links(path):
+    """
+    Parse a note into the parse_links() cache, ignoring errors.
+    
+    Errors are raised again when the note is parsed for real, in traversal order.
+    
+    Args:
+        path (str): Path to the markdown file
+    """
+    try:
+        parse_links(path)
+    except (OSError, ValueError):
+        pass
+
+
+def clear_link_cache():
+    """Drop all parse results cached by parse_links()."""
+    _parse_links_cached.cache_clear()
+
+
+def link_target(file_link, is_image=False):
+    """
+    Return the file a wiki-link points at, as looked up in the vault.
+    
+    Args:
+        file_link (str): The text between the brackets, e.g. "note#section|Alias"
+        is_image (bool, optional): Whether the link is an embed (![[...]]), whose
+            target keeps its own extension. Defaults to False.
+        
+    Returns:
+        str: The file part of the link, e.g. "note.md", or "" for a link to a
+            section of the current note ([[#section]])
+    """
+    # Equivalent to file_link.split("#")[0].split("|")[0] without building lists
+    hash_index = file_link.find("#")
+    if hash_index != -1:
+        file_link = file_link[:hash_index]
+    pipe_index = file_link.find("|")
+    if pipe_index != -1:
+        file_link = file_link[:pipe_index]
+    
+    # Note links may leave out the .md extension
+    if file_link and not is_image and not file_link.endswith('.md'):
+        file_link = file_link + '.md'
+    return file_link
+
+
+def _copied_files(files_already_copied):
+    """
+    Return the list of copied files, creating it if needed, with a set for lookups.
+    
+    Args:
+        files_already_copied (list or None): List of already copied files
+        
+    Returns:
+        tuple: (files_already_copied, set of their normalized paths)
+    """
+    # Initialize the list of already copied files if none provided
+    if files_already_copied is None:
+        files_already_copied = []
+    return files_already_copied, {os.path.normpath(ensure_str_path(f)) for f in files_already_copied}
+
+
+def _notes_dir(export_dir):
+    """
+    Return the notes directory of an export, defaulting to ~/Desktop/export.
+    
+    Args:
+        export_dir (str or None): Export directory path
+        
+    Returns:
+        str: The export's notes directory
+    """
+    # Set default export directory if none provided
+    if export_dir is None:
+        export_dir = os.path.join(os.path.expanduser("~/Desktop"), "export")
+    return os.path.join(export_dir, "notes")
+
+
+def _record_linked_file(file_to_find, original_dir, files_already_copied, files_already_copied_set,
+                        file_index=None, resolved_links=None, lookup_cache=None, announce=None):
+    """
+    Find a linked file and record it as exported unless it already was.
+    
+    Args:
+        file_to_find (str): The filename to find
+        original_dir (str): Absolute directory of the file containing the link
+        files_already_copied (list): List of already copied files
+        files_already_copied_set (set): Normalized paths of files_already_copied
+        file_index (dict, optional): Per-export directory index cache. Defaults to None.
+        resolved_links (dict, optional): Lookups already made for the current note,
+            mapping filenames to paths or None. Defaults to None.
+        lookup_cache (dict, optional): Per-export cache mapping (filename, directory)
+            to the found path or None. Defaults to None.
+        announce (tuple, optional): (kind, current_name) for a "Processing" line that
+            is printed unless the file was already exported. Defaults to None.
+        
+    Returns:
+        tuple: (linked_file_path, is_new) where linked_file_path is None if the file
+            was not found and is_new is True if it was recorded by this call
+    """
+    if resolved_links is not None and file_to_find in resolved_links:
+        # Already looked up while counting links
+        linked_file_path = resolved_links[file_to_find]
+    else:
+        # Find the file using our helper function (its result is already normalized)
+        linked_file_path = find_file_cached(file_to_find, original_dir, file_index, lookup_cache)
+    
+    # Try to make output more readable by only printing when something new is found
+    if announce is not None and linked_file_path not in files_already_copied_set:
+        kind, current_name = announce
+        print(f"Processing {kind}: {file_to_find} from {current_name}")
+    
+    if not linked_file_path:
+        print(f"Warning: Could not find linked file: {file_to_find}")
+        return None, False
+    
+    # Files that were already exported need neither another copy nor another
+    # traversal (this also prevents circular references)
+    if linked_file_path in files_already_copied_set:
+        return linked_file_path, False
+    
+    # Record the file before copying so repeated links to it hit the check above
+    files_already_copied.append(ensure_str_path(linked_file_path))
+    files_already_copied_set.add(linked_file_path)
+    
+    return linked_file_path, True
 
 
 def copy_file_to_export(file_to_find, current_file, traverse=False, export_dir=None, 
-                       files_already_copied=None, max_depth=None):
+                       files_already_copied=None, max_depth=None, file_index=None):
     """
-    Copy a file to the export directory and optionally process its links recursively.
+    Copy a file to the export directory and optionally process its links.
     
     Args:
         file_to_find (str): The filename to find and copy
         current_file (str): The current file being processed
-        traverse (bool, optional): Whether to recursively process the file. Defaults to False.
+        traverse (bool, optional): Whether to also export the notes linked from the file.
+            Defaults to False.
         export_dir (str, optional): Export directory path. Defaults to None.
         files_already_copied (list, optional): List of already copied files. Defaults to None.
         max_depth (int, optional): Maximum recursion depth. Defaults to None.
+        file_index (dict, optional): Per-export directory index cache. Defaults to None.
         
     Returns:
         str or None: The basename of the copied file or None if not found
     """
-    # Normalize paths for consistency
-    current_file = os.path.normpath(ensure_str_path(current_file))
-    
     # Check recursion depth limit - if max_depth is 0, we should still copy this file
-    # but not process it further
+    # but not process it further. Checked first so pruned calls do no work at all.
     if max_depth is not None and max_depth < 0:
         return None
     
     # If file_to_find is empty, return None
     if not file_to_find or file_to_find.strip() == "":
         return None
-        
-    # Set default export directory if none provided
-    if export_dir is None:
-        export_dir = os.path.join(os.path.expanduser("~/Desktop"), "export")
     
-    # Initialize the list of already copied files if none provided
-    if files_already_copied is None:
-        files_already_copied = []
+    # Normalize paths for consistency
+    current_file = os.path.normpath(ensure_str_path(current_file))
+    notes_dir = _notes_dir(export_dir)
+    files_already_copied, files_already_copied_set = _copied_files(files_already_copied)
+    if file_index is None:
+        file_index = {}
     
-    # Get the directory of the original file
-    original_dir = os.path.dirname(os.path.abspath(current_file))
+    linked_file_path, is_new = _record_linked_file(
+        file_to_find, 
+        os.path.dirname(os.path.abspath(current_file)), 
+        files_already_copied, 
+        files_already_copied_set, 
+        file_index
+    )
     
-    # Find the file using our helper function
-    linked_file_path = find_file_in_directory(file_to_find, original_dir)
+    if linked_file_path is None:
+        return None
     
-    if linked_file_path:
-        # Create notes directory if it doesn't exist
-        notes_dir = os.path.join(export_dir, "notes")
-        os.makedirs(notes_dir, exist_ok=True)
-        
+    if is_new:
         # Preserve original filename
-        dest_file = os.path.join(notes_dir, os.path.basename(linked_file_path))
-        shutil.copyfile(linked_file_path, dest_file)
-        
-        # Normalize linked file path for consistency in comparisons
-        linked_file_path = os.path.normpath(linked_file_path)
+        pending_copies = {os.path.join(notes_dir, os.path.basename(linked_file_path)): linked_file_path}
         
-        # Add file to copied list if not already there
-        if linked_file_path not in files_already_copied:
-            files_already_copied.append(ensure_str_path(linked_file_path))
-            
-        # Only traverse if requested AND we have remaining depth AND not already traversed (prevents circular references)
-        if traverse and linked_file_path not in [os.path.normpath(f) for i, f in enumerate(files_already_copied) if i < len(files_already_copied) - 1]:
-            
-            # When traversing to the next level, decrement max_depth
-            next_depth = None if max_depth is None else max_depth - 1
-            
-            # Only recurse if we have depth remaining
-            if next_depth is None or next_depth >= 0:
-                read_files_recursive(
-                    linked_file_path, 
-                    max_depth=next_depth, 
-                    export_dir=export_dir, 
-                    files_already_copied=files_already_copied
-                )
-        
-        return os.path.basename(linked_file_path)
-    else:
-        print(f"Warning: Could not find linked file: {file_to_find}")
-        return None
+        # When traversing to the next level, decrement max_depth
+        if traverse:
+            _export_levels(
+                [linked_file_path], 
+                None if max_depth is None else max_depth - 1, 
+                notes_dir, 
+                files_already_copied, 
+                files_already_copied_set, 
+                file_index, 
+                pending_copies
+            )
+        _run_copies(pending_copies)
+    
+    return os.path.basename(linked_file_path)
 
 
 def find_markdown_links(line, current_file, export_dir=None, 
-                       files_already_copied=None, max_depth=None):
+                       files_already_copied=None, max_depth=None, file_index=None):
     """
     Find and process Markdown-style links in the given line.
     
+    Linked notes are copied, and their own links followed while depth remains.
+    
     Args:
         line (str): The line of text to process
         current_file (str): The current file being processed
         export_dir (str, optional): Export directory path. Defaults to None.
         files_already_copied (list, optional): List of already copied files. Defaults to None.
         max_depth (int, optional): Maximum recursion depth. Defaults to None.
+        file_index (dict, optional): Per-export directory index cache. Defaults to None.
         
     Returns:
         str: The processed line with links handled
@@ -111,47 +407,44 @@ def find_markdown_links(line, current_file, export_dir=None,
     if max_depth is not None and max_depth <= 0:
         return line
     
-    pattern = re.compile(r"(?<!!)\[\[([^\]]*)\]\]")
-    for file_link in re.findall(pattern, line):
-        file_only = file_link.split("#")[0].split("|")[0]
-        
-        # Handle anchor links
-        if len(file_link.split("#")) > 1:
-            # Just handling the file part, ignoring anchors for file copy operation
-            pass
-        
-        # Handle self-referential links
-        if file_only == "":
-            file_only = Path(current_file).name.replace(".md", "")
-        else:
-            # Add .md extension if needed
-            if not file_only.endswith('.md') and file_only:
-                file_only = file_only + '.md'
-            
-            # Skip empty file names
-            if not file_only:
-                continue
-                
-            # Set traverse to True only if we can go deeper (max_depth > 1 or None)
-            should_traverse = max_depth is None or max_depth > 1
-            
-            # Try to make output more readable by only printing when something new is found
-            if files_already_copied is not None and not any(file_only in f for f in files_already_copied):
-                print(f"Processing link: {file_only} from {Path(current_file).name}")
-                
-            copy_file_to_export(
-                file_only, 
-                current_file, 
-                traverse=should_traverse, 
-                export_dir=export_dir, 
-                files_already_copied=files_already_copied, 
-                max_depth=max_depth
-            )
+    # Skip the regex entirely for lines without any links
+    if "[[" not in line:
+        return line
+    
+    notes_dir = _notes_dir(export_dir)
+    files_already_copied, files_already_copied_set = _copied_files(files_already_copied)
+    if file_index is None:
+        file_index = {}
+    pending_copies = {}
+    
+    links = [(False, file_link) for file_link in _MD_LINK_RE.findall(line)]
+    _, new_notes = _export_links(
+        links, 
+        current_file, 
+        max_depth, 
+        notes_dir, 
+        files_already_copied, 
+        files_already_copied_set, 
+        file_index, 
+        pending_copies
+    )
+    
+    # The linked notes export their own links one level further down
+    _export_levels(
+        new_notes, 
+        None if max_depth is None else max_depth - 1, 
+        notes_dir, 
+        files_already_copied, 
+        files_already_copied_set, 
+        file_index, 
+        pending_copies
+    )
+    _run_copies(pending_copies)
     
     return line
 
 
-def find_image_links(line, current_file, export_dir=None, files_already_copied=None):
+def find_image_links(line, current_file, export_dir=None, files_already_copied=None, file_index=None):
     """
     Find and process image links in the given line.
     
@@ -160,94 +453,217 @@ def find_image_links(line, current_file, export_dir=None, files_already_copied=N
         current_file (str): The current file being processed
         export_dir (str, optional): Export directory path. Defaults to None.
         files_already_copied (list, optional): List of files already copied. Used for tracking.
+        file_index (dict, optional): Per-export directory index cache. Defaults to None.
         
     Returns:
-        tuple: (processed_line, count_of_images_found)
+        int: The number of images found in the line
     """
-    pattern = re.compile(r"!\[\[([^\]]*)\]\]")
+    # Skip the regex entirely for lines without any embeds
+    if "![[" not in line:
+        return 0
+    
+    files_already_copied, files_already_copied_set = _copied_files(files_already_copied)
+    pending_copies = {}
+    
+    links = [(True, file_link) for file_link in _IMG_LINK_RE.findall(line)]
+    assets_count, _ = _export_links(
+        links, 
+        current_file, 
+        None, 
+        _notes_dir(export_dir), 
+        files_already_copied, 
+        files_already_copied_set, 
+        {} if file_index is None else file_index, 
+        pending_copies
+    )
+    _run_copies(pending_copies)
+    
+    return assets_count
+
+
+def _export_links(links, current_file, max_depth, notes_dir, files_already_copied, files_already_copied_set,
+                  file_index, pending_copies, graph=None, lookup_cache=None):
+    """
+    Copy everything a note links to and report which linked notes are new.
+    
+    Linked notes are copied but not read; the caller decides whether to follow them.
+    
+    Args:
+        links (iterable): (is_image, link_text) pairs, as returned by parse_links()
+        current_file (str): Path of the note containing the links
+        max_depth (int or None): Remaining depth for this file; note links are only
+            followed while it is above 0
+        notes_dir (str): The export's notes directory
+        files_already_copied (list): List of already copied files
+        files_already_copied_set (set): Normalized paths of files_already_copied
+        file_index (dict): Per-export directory index cache
+        pending_copies (dict): Destination-to-source map of deferred copies
+        graph (dict, optional): Links resolved by count_expected_links. Defaults to None.
+        lookup_cache (dict, optional): Per-export cache of link lookups. Defaults to None.
+        
+    Returns:
+        tuple: (count_of_images_found, list_of_newly_exported_notes)
+    """
+    # Note links are only followed while depth remains; images are always copied
+    follow_links = max_depth is None or max_depth > 0
+    current_name = os.path.basename(current_file)
+    
+    # Links resolve relative to the note's directory, which is the same for every link
+    original_dir = os.path.dirname(os.path.abspath(current_file))
+    resolved_links = None if graph is None else graph.get(os.path.normpath(current_file))
     assets_count = 0
+    new_notes = []
+    
+    # Targets already handled for this note; repeated links need no second lookup
+    seen_targets = set()
     
-    for file_link in re.findall(pattern, line):
-        file_only = file_link.split("#")[0].split("|")[0]
+    for is_image, file_link in links:
+        if not is_image and not follow_links:
+            continue
         
-        # Skip empty file names
+        # Self-referential links ([[#section]]) point at the current file
+        file_only = link_target(file_link, is_image)
         if not file_only:
             continue
-            
-        # Handle self-referential links
-        if file_only == "":
-            file_only = Path(current_file).name.replace(".md", "")
-        else:
-            # Try to make output more readable by only printing when something new is found
-            if files_already_copied is not None and not any(file_only in f for f in files_already_copied):
-                print(f"Processing image: {file_only} from {Path(current_file).name}")
-                
-            copy_file_to_export(
-                file_only, 
-                current_file, 
-                traverse=False,
-                export_dir=export_dir,
-                files_already_copied=files_already_copied
-            )
         
-        assets_count += 1
+        # Repeated embeds still count as images found
+        if is_image:
+            assets_count += 1
+        
+        # Keyed by kind too: an embedded note is copied but never traversed
+        target = (is_image, file_only)
+        if target in seen_targets:
+            continue
+        seen_targets.add(target)
+        
+        linked_file_path, is_new = _record_linked_file(
+            file_only, 
+            original_dir, 
+            files_already_copied, 
+            files_already_copied_set, 
+            file_index,
+            resolved_links,
+            lookup_cache,
+            ("image" if is_image else "link", current_name)
+        )
+        
+        if is_new:
+            # Preserve original filename; keyed by destination so the last source wins
+            pending_copies[os.path.join(notes_dir, os.path.basename(linked_file_path))] = linked_file_path
+            if not is_image:
+                new_notes.append(linked_file_path)
     
-    return (line, assets_count)
+    return assets_count, new_notes
 
 
-def read_files_recursive(path, max_depth=None, export_dir=None, files_already_copied=None):
+def _export_levels(level, depth, notes_dir, files_already_copied, files_already_copied_set,
+                   file_index, pending_copies, graph=None, lookup_cache=None):
     """
-    Recursively read and process markdown files, copying them to the export directory.
+    Export the links of some notes and of the notes they lead to, level by level.
+    
+    Linked notes are visited breadth-first rather than by recursion, so deep link
+    chains cannot hit Python's recursion limit, and each note is read at most once.
+    The notes of a level are read on a thread pool; their links are then exported
+    in order, so the result matches a sequential walk.
+    
+    Args:
+        level (list): Notes, already exported themselves, whose links to export
+        depth (int or None): Remaining depth of those notes; at 0 they are not read
+        notes_dir (str): The export's notes directory
+        files_already_copied (list): List of already copied files
+        files_already_copied_set (set): Normalized paths of files_already_copied
+        file_index (dict): Per-export directory index cache
+        pending_copies (dict): Destination-to-source map of deferred copies
+        graph (dict, optional): Links resolved by count_expected_links. Defaults to None.
+        lookup_cache (dict, optional): Per-export cache of link lookups. Defaults to None.
+    """
+    # At depth 0 only the notes themselves are exported, so they are not even read
+    if depth is not None and depth <= 0:
+        return
+    
+    with ThreadPoolExecutor(max_workers=_PARSE_WORKERS) as executor:
+        while level:
+            # Reading is I/O-bound; warm the parse cache for the whole level at once.
+            # The cache is unbounded, so nothing prefetched is evicted before use.
+            if len(level) > 1:
+                list(executor.map(_prefetch_links, level))
+            
+            next_level = []
+            for current_file in level:
+                assets_count, new_notes = _export_links(
+                    parse_links(current_file), 
+                    current_file, 
+                    depth, 
+                    notes_dir, 
+                    files_already_copied, 
+                    files_already_copied_set, 
+                    file_index, 
+                    pending_copies,
+                    graph,
+                    lookup_cache
+                )
+                
+                # Linked notes are only read if they may in turn export their own links
+                if depth is None or depth > 1:
+                    next_level.extend(new_notes)
+                
+                print(f"Exported: {current_file}" + (f" ({assets_count} images)" if assets_count > 0 else ''))
+            
+            level = next_level
+            depth = None if depth is None else depth - 1
+
+
+def read_files_recursive(path, max_depth=None, export_dir=None, files_already_copied=None,
+                         file_index=None, graph=None, lookup_cache=None):
+    """
+    Read a markdown file and every note it links to, copying them to the export directory.
+    
+    Linked notes are visited breadth-first, one level at a time (see _export_levels),
+    and the copies of the whole traversal are run together on a thread pool.
     
     Args:
         path (str): Path to the markdown file to process
         max_depth (int, optional): Maximum recursion depth. Defaults to None.
         export_dir (str, optional): Export directory path. Defaults to None.
         files_already_copied (list, optional): List of already copied files. Defaults to None.
+        file_index (dict, optional): Per-export directory index cache shared across the
+            traversal so each directory tree is walked at most once. Defaults to None.
+        graph (dict, optional): Links already resolved by count_expected_links, so
+            they are not looked up again. Defaults to None.
+        lookup_cache (dict, optional): Per-export cache mapping (filename, directory)
+            to the found path or None, so links repeated across notes of one
+            directory are looked up once. Defaults to None.
     """
     # Check recursion depth limit
     if max_depth is not None and max_depth < 0:
         return
     
-    # Set default export directory if none provided
-    if export_dir is None:
-        export_dir = os.path.join(os.path.expanduser("~/Desktop"), "export")
-    
-    # Initialize the list of already copied files if none provided
-    if files_already_copied is None:
-        files_already_copied = []
+    notes_dir = _notes_dir(export_dir)
     
-    # Create notes directory if it doesn't exist
-    notes_dir = os.path.join(export_dir, "notes")
-    os.makedirs(notes_dir, exist_ok=True)
+    # Build the membership set once for the whole traversal
+    files_already_copied, files_already_copied_set = _copied_files(files_already_copied)
     
-    # Copy the main file
-    dest_file = os.path.join(notes_dir, os.path.basename(path))
-    shutil.copyfile(path, dest_file)
+    # Initialize the directory index cache if none provided
+    if file_index is None:
+        file_index = {}
     
-    # Read the file content
-    with open(path, "r", encoding='utf-8') as read_file:
-        data = read_file.readlines()
+    # Initialize the lookup cache if none provided
+    if lookup_cache is None:
+        lookup_cache = {}
     
-    assets_count = 0
+    # Every copy, starting with the main file, is collected and run together at the end
+    pending_copies = {os.path.join(notes_dir, os.path.basename(path)): path}
     
-    # Process links
-    for line in data:
-        find_markdown_links(
-            line, 
-            current_file=path, 
-            export_dir=export_dir, 
-            files_already_copied=files_already_copied, 
-            max_depth=max_depth
-        )
-        
-        line, image_count = find_image_links(
-            line, 
-            current_file=path, 
-            export_dir=export_dir,
-            files_already_copied=files_already_copied
-        )
-        
-        assets_count += image_count
+    _export_levels(
+        [path], 
+        max_depth, 
+        notes_dir, 
+        files_already_copied, 
+        files_already_copied_set, 
+        file_index, 
+        pending_copies, 
+        graph, 
+        lookup_cache
+    )
     
-    print(f"Exported: {path}" + (f" ({assets_count} images)" if assets_count > 0 else '')) 
\ No newline at end of file
+    _run_copies(pending_copies)
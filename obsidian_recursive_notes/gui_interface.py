@@ -5,15 +5,19 @@ This module provides a graphical user interface for the Markdown exporter.
 It includes dialogs for selecting files and configuring export options.
 """
 
+import contextlib
 import os
 import shutil
-import re
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 from tkinter import filedialog, messagebox, simpledialog
 
 # Import from our modules
-from .path_utils import ensure_str_path, create_export_dir, resolve_path, find_file_in_directory
-from .file_operations import read_files_recursive
+from .path_utils import ensure_str_path, create_export_dir, clear_export_dir, resolve_path, find_file_cached
+from .file_operations import _PARSE_WORKERS, clear_link_cache, link_target, parse_links, read_files_recursive
+
+# Extensions counted as images in the export summary
+_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.svg')
 
 
 def create_hidden_root():
@@ -28,62 +32,120 @@ def create_hidden_root():
     return root
 
 
-def select_file():
+@contextlib.contextmanager
+def _hidden_root(root=None):
+    """
+    Provide a hidden root window for dialogs, reusing the caller's if given.
+    
+    Starting Tk is slow, so a root passed in is used as is and left open;
+    only a root created here is destroyed afterwards.
+    
+    Args:
+        root (tk.Tk, optional): An existing hidden root window. Defaults to None.
+        
+    Yields:
+        tk.Tk: A hidden root window
+    """
+    if root is not None:
+        yield root
+        return
+    
+    root = create_hidden_root()
+    try:
+        yield root
+    finally:
+        # Clean up the root window
+        root.destroy()
+
+
+def select_file(root=None):
     """
     Open a file dialog to select a Markdown file.
     
+    Args:
+        root (tk.Tk, optional): Hidden root window to reuse. Defaults to None.
+        
     Returns:
         str or None: Path to the selected file, or None if cancelled
     """
-    root = create_hidden_root()
-    
-    # Show the file dialog
-    file_path = filedialog.askopenfilename(
-        title="Select Markdown File",
-        filetypes=[("Markdown Files", "*.md"), ("All Files", "*.*")]
-    )
-    
-    # Clean up the root window
-    root.destroy()
+    with _hidden_root(root) as root:
+        # Show the file dialog
+        file_path = filedialog.askopenfilename(
+            parent=root,
+            title="Select Markdown File",
+            filetypes=[("Markdown Files", "*.md"), ("All Files", "*.*")]
+        )
     
     # Return the selected file path or None if cancelled
     return file_path if file_path else None
 
 
-def get_max_depth():
+def get_max_depth(root=None):
     """
     Show dialog box to get recursion depth from the user.
     
+    Args:
+        root (tk.Tk, optional): Hidden root window to reuse. Defaults to None.
+        
     Returns:
         int or None: Maximum recursion depth or None for unlimited
     """
-    root = create_hidden_root()
-    
-    # Ask about recursion depth
-    max_depth = simpledialog.askinteger(
-        title="Recursion Depth",
-        prompt="Enter maximum recursion depth (leave empty for unlimited):\n\n"
-               "0: Only the main file\n"
-               "1: Main file and directly linked files\n"
-               "2+: Follow links to the specified depth\n",
-        minvalue=0
-    )
-    
-    # Clean up the root window
-    root.destroy()
+    with _hidden_root(root) as root:
+        # Ask about recursion depth
+        max_depth = simpledialog.askinteger(
+            title="Recursion Depth",
+            prompt="Enter maximum recursion depth (leave empty for unlimited):\n\n"
+                   "0: Only the main file\n"
+                   "1: Main file and directly linked files\n"
+                   "2+: Follow links to the specified depth\n",
+            minvalue=0,
+            parent=root
+        )
     
     return max_depth
 
 
-def count_expected_links(file_path, visited=None, current_depth=0, max_depth=None):
+def _parse_or_error(file_path):
+    """
+    Parse a note's links, returning the error instead of raising it.
+    
+    Args:
+        file_path (str): Path to the markdown file
+        
+    Returns:
+        tuple: (links, error) where exactly one of them is None
+    """
+    try:
+        return parse_links(file_path), None
+    except Exception as e:
+        return None, e
+
+
+def count_expected_links(file_path, visited=None, current_depth=0, max_depth=None, file_index=None,
+                         graph=None, lookup_cache=None):
     """
     Count the number of unique markdown links in the file and its linked files up to max_depth.
     
+    Linked notes are visited breadth-first one level at a time, like
+    read_files_recursive, so deep link chains cannot hit Python's recursion
+    limit and every note is counted at the same depth the export reaches it.
+    The notes of each level are read in parallel, which also warms the parse
+    cache for the export.
+    
     Args:
         file_path (str): Path to the markdown file
         visited (set, optional): Set of already visited files. Defaults to None.
-        current_depth (int, optional): Current recursion depth. Defaults to 0.
-        max_depth (int, optional): Maximum recursion depth. Defaults to None (unlimited).
+        current_depth (int, optional): Depth of file_path itself. Defaults to 0.
+        max_depth (int, optional): Maximum link depth. Defaults to None (unlimited).
+        file_index (dict, optional): Per-export directory index cache, shared with
+            read_files_recursive when passed by the caller so each directory tree
+            is walked at most once. Defaults to None.
+        graph (dict, optional): Filled with the links resolved while counting, as
+            {note_path: {linked_filename: linked_path_or_None}}, for reuse by
+            read_files_recursive. Defaults to None.
+        lookup_cache (dict, optional): Per-export cache of link lookups, mapping
+            (filename, directory) to the found path or None, shared with
+            read_files_recursive when passed by the caller. Defaults to None.
         
     Returns:
         tuple: (count, visited_set) - Number of unique links and set of visited files
@@ -92,6 +154,15 @@ def count_expected_links(file_path, visited=None, current_depth=0, max_depth=Non
     if visited is None:
         visited = set()
     
+    # Initialize the directory index cache if not provided
+    if file_index is None:
+        file_index = {}
+    
+    # Initialize the lookup cache if not provided; misses are cached too, so stub
+    # links repeated across notes are only looked up once per directory
+    if lookup_cache is None:
+        lookup_cache = {}
+    
     # Add current file to visited set - normalize path to handle path differences
     file_path = os.path.normpath(ensure_str_path(file_path))
     
@@ -105,189 +176,228 @@ def count_expected_links(file_path, visited=None, current_depth=0, max_depth=Non
     # Initialize count (includes the current file)
     count = 1  # Start with 1 for the current file
     
-    # If we're at max depth, don't process links further
+    # At max depth only the file itself counts; don't read it or start the pool
     if max_depth is not None and current_depth >= max_depth:
         return count, visited
     
-    # Regular expressions to find markdown links and image links
-    md_link_pattern = re.compile(r"(?<!!)\[\[([^\]]*)\]\]")
-    img_link_pattern = re.compile(r"!\[\[([^\]]*)\]\]")
+    # Notes whose links are still to be counted, one breadth-first level at a time
+    level = [file_path]
+    depth = current_depth
     
-    try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+    # Reading notes is I/O-bound, so each level is parsed on a thread pool
+    with ThreadPoolExecutor(max_workers=_PARSE_WORKERS) as executor:
+        # If we're at max depth, don't process links further
+        while level and (max_depth is None or depth < max_depth):
+            # Parsed once per file and reused by the export itself
+            if len(level) == 1:
+                parsed = [_parse_or_error(level[0])]
+            else:
+                parsed = list(executor.map(_parse_or_error, level))
             
-            # Find all markdown links
-            md_matches = md_link_pattern.findall(content)
-            img_matches = img_link_pattern.findall(content)
+            next_level = []
             
-            # Process markdown links (for documents)
-            for match in md_matches:
-                # Get file path portion (ignoring anchors and aliases)
-                file_only = match.split("#")[0].split("|")[0]
-                
-                # Add .md extension if needed
-                if not file_only.endswith('.md') and file_only:
-                    file_only = file_only + '.md'
-                
-                # Skip empty file names
-                if not file_only:
+            # Results are merged in order, so the count matches a sequential walk
+            for current_file, (links, error) in zip(level, parsed):
+                if error is not None:
+                    print(f"Error counting links in {current_file}: {error}")
                     continue
                 
-                # Get absolute path to the linked file
-                original_dir = os.path.dirname(os.path.abspath(file_path))
-                
-                # Find the file using our helper function
-                linked_file_path = find_file_in_directory(file_only, original_dir)
-                file_found = linked_file_path is not None
+                # Links resolve relative to this file's directory, the same for every link
+                original_dir = os.path.dirname(os.path.abspath(current_file))
                 
-                # Check if file exists and hasn't been visited yet
-                if file_found and linked_file_path not in visited:
-                    # Get count from recursive call (add to total)
-                    sub_count, visited = count_expected_links(
-                        linked_file_path, 
-                        visited, 
-                        current_depth + 1, 
-                        max_depth
-                    )
-                    count += sub_count
-            
-            # Process image links (for assets)
-            for match in img_matches:
-                file_only = match.split("#")[0].split("|")[0]
+                # Record every lookup, misses included, so the export can skip them
+                resolved_links = None if graph is None else graph.setdefault(current_file, {})
                 
-                # Skip empty file names
-                if not file_only:
-                    continue
+                try:
+                    # Find all markdown links
+                    md_matches = [match for is_image, match in links if not is_image]
+                    img_matches = [match for is_image, match in links if is_image]
                     
-                original_dir = os.path.dirname(os.path.abspath(file_path))
-                
-                # Find the file using our helper function
-                linked_file_path = find_file_in_directory(file_only, original_dir)
-                file_found = linked_file_path is not None
-                
-                # Check if file exists and hasn't been visited yet
-                if file_found and linked_file_path not in visited:
-                    visited.add(linked_file_path)
-                    count += 1
-    except Exception as e:
-        print(f"Error counting links in {file_path}: {e}")
+                    # Process markdown links (for documents)
+                    for match in md_matches:
+                        # Get file path portion (ignoring anchors and aliases, adding .md)
+                        file_only = link_target(match)
+                        
+                        # Skip empty file names
+                        if not file_only:
+                            continue
+                        
+                        # Find the file using our helper function, unless it was already looked up
+                        linked_file_path = find_file_cached(file_only, original_dir, file_index, lookup_cache)
+                        file_found = linked_file_path is not None
+                        
+                        if resolved_links is not None:
+                            resolved_links[file_only] = linked_file_path
+                        
+                        # Check if file exists and hasn't been visited yet
+                        if file_found and linked_file_path not in visited:
+                            # Count the note now and its own links with the next level
+                            visited.add(linked_file_path)
+                            count += 1
+                            next_level.append(linked_file_path)
+                    
+                    # Process image links (for assets)
+                    for match in img_matches:
+                        file_only = link_target(match, is_image=True)
+                        
+                        # Skip empty file names
+                        if not file_only:
+                            continue
+                        
+                        # Find the file using our helper function, unless it was already looked up
+                        linked_file_path = find_file_cached(file_only, original_dir, file_index, lookup_cache)
+                        file_found = linked_file_path is not None
+                        
+                        if resolved_links is not None:
+                            resolved_links[file_only] = linked_file_path
+                        
+                        # Check if file exists and hasn't been visited yet
+                        if file_found and linked_file_path not in visited:
+                            visited.add(linked_file_path)
+                            count += 1
+                except Exception as e:
+                    print(f"Error counting links in {current_file}: {e}")
+            
+            level = next_level
+            depth += 1
     
     return count, visited
 
 
-def run_export(file_path, max_depth=None):
+def run_export(file_path, max_depth=None, root=None):
     """
     Run the export process with the given options.
     
     Args:
         file_path (str): Path to the Markdown file to export
         max_depth (int, optional): Maximum recursion depth. Defaults to None (unlimited).
+        root (tk.Tk, optional): Hidden root window to reuse for the message boxes.
+            Defaults to None, in which case one is created for the whole export.
         
     Returns:
         bool: True if export was successful, False otherwise
     """
-    # Resolve the file path
-    file_to_export, error = resolve_path(file_path)
-    
-    if error:
-        # Show error message
-        root = create_hidden_root()
-        messagebox.showerror("Error", error)
-        root.destroy()
-        return False
+    # One hidden root serves every message box of the export
+    with _hidden_root(root) as root:
+        # Resolve the file path
+        file_to_export, error = resolve_path(file_path)
+        
+        if error:
+            # Show error message
+            messagebox.showerror("Error", error, parent=root)
+            return False
 
-    # Count expected links before export
-    print(f"Counting expected links for: {file_to_export}")
-    expected_count, visited_files = count_expected_links(file_to_export, max_depth=max_depth)
-    print(f"Expected file count: {expected_count}")
-    print(f"Files that should be included: {[os.path.basename(f) for f in visited_files]}")
+        # Share one directory index between counting and exporting so the vault is walked once
+        file_index = {}
+        
+        # Links resolved while counting, reused by the export instead of looking them up again
+        link_graph = {}
+        lookup_cache = {}
+        
+        # Start from a fresh parse cache; counting fills it and the export reuses it
+        clear_link_cache()
 
-    # Create export directory
-    export_dir = create_export_dir(file_path)
-    
-    # Show info about export location
-    root = create_hidden_root()
-    messagebox.showinfo(
-        "Export Location",
-        f"Files will be exported to:\n{export_dir}\nExpected file count: {expected_count}"
-    )
-    root.destroy()
-    
-    # Clean up existing export directory if it exists
-    if os.path.exists(export_dir) and os.path.isdir(export_dir):
-        shutil.rmtree(export_dir)
-        os.makedirs(export_dir, exist_ok=True)
-        os.makedirs(os.path.join(export_dir, "notes"), exist_ok=True)
+        # Count expected links before export
+        print(f"Counting expected links for: {file_to_export}")
+        expected_count, visited_files = count_expected_links(
+            file_to_export, 
+            max_depth=max_depth, 
+            file_index=file_index,
+            graph=link_graph,
+            lookup_cache=lookup_cache
+        )
+        print(f"Expected file count: {expected_count}")
+        print(f"Files that should be included: {[os.path.basename(f) for f in visited_files]}")
 
-    # Copy the main file with its original name
-    dest_file = os.path.join(export_dir, "notes", os.path.basename(file_to_export))
-    shutil.copyfile(file_to_export, dest_file)
-    
-    # Keep track of copied files
-    files_copied = [ensure_str_path(file_to_export)]
+        # Create export directory
+        export_dir = create_export_dir(file_path)
+        
+        # Show info about export location
+        messagebox.showinfo(
+            "Export Location",
+            f"Files will be exported to:\n{export_dir}\nExpected file count: {expected_count}",
+            parent=root
+        )
+        
+        # Clean up existing export directory if it exists; the old files are deleted in the background
+        clear_export_dir(export_dir)
 
-    # Process the main file and its linked files
-    print(f"Starting file processing with max_depth={max_depth}...")
-    read_files_recursive(
-        file_to_export, 
-        max_depth=max_depth,
-        export_dir=export_dir, 
-        files_already_copied=files_copied
-    )
-    
-    print(f"Completed file processing. Files copied: {len(files_copied)}")
-    print(f"Files copied: {[os.path.basename(f) for f in files_copied]}")
-    
-    # Compare expected vs actual file count
-    actual_count = len(files_copied)
-    
-    # Count distinct file types
-    md_files = sum(1 for f in files_copied if f.lower().endswith('.md'))
-    image_files = sum(1 for f in files_copied if any(f.lower().endswith(ext) for ext in ['.png', '.jpg', '.jpeg', '.gif', '.svg']))
-    other_files = actual_count - md_files - image_files
-    
-    completion_message = (
-        f"Files have been exported to:\n{export_dir}\n\n"
-        f"File Count Summary:\n"
-        f"Expected: {expected_count}\n"
-        f"Actual: {actual_count}\n\n"
-        f"Breakdown:\n"
-        f"Markdown files: {md_files}\n"
-        f"Image files: {image_files}\n"
-        f"Other files: {other_files}"
-    )
-    
-    if expected_count > actual_count:
-        completion_message += f"\n\n⚠️ {expected_count - actual_count} files may be missing!"
-    elif expected_count < actual_count:
-        completion_message += f"\n\n⚠️ {actual_count - expected_count} additional files were copied!"
-    else:
-        completion_message += "\n\n✓ All expected files were copied successfully!"
-    
-    # Show completion message
-    root = create_hidden_root()
-    messagebox.showinfo("Export Complete", completion_message)
-    root.destroy()
-    
-    return True
+        # Copy the main file with its original name
+        dest_file = os.path.join(export_dir, "notes", os.path.basename(file_to_export))
+        shutil.copyfile(file_to_export, dest_file)
+        
+        # Keep track of copied files
+        files_copied = [ensure_str_path(file_to_export)]
+
+        # Process the main file and its linked files
+        print(f"Starting file processing with max_depth={max_depth}...")
+        read_files_recursive(
+            file_to_export, 
+            max_depth=max_depth,
+            export_dir=export_dir, 
+            files_already_copied=files_copied,
+            file_index=file_index,
+            graph=link_graph,
+            lookup_cache=lookup_cache
+        )
+        
+        print(f"Completed file processing. Files copied: {len(files_copied)}")
+        print(f"Files copied: {[os.path.basename(f) for f in files_copied]}")
+        
+        # Compare expected vs actual file count
+        actual_count = len(files_copied)
+        
+        # Count distinct file types in one pass, lower-casing each path once
+        md_files = image_files = 0
+        for f in files_copied:
+            f = f.lower()
+            if f.endswith('.md'):
+                md_files += 1
+            elif f.endswith(_IMAGE_EXTENSIONS):
+                image_files += 1
+        other_files = actual_count - md_files - image_files
+        
+        completion_message = (
+            f"Files have been exported to:\n{export_dir}\n\n"
+            f"File Count Summary:\n"
+            f"Expected: {expected_count}\n"
+            f"Actual: {actual_count}\n\n"
+            f"Breakdown:\n"
+            f"Markdown files: {md_files}\n"
+            f"Image files: {image_files}\n"
+            f"Other files: {other_files}"
+        )
+        
+        if expected_count > actual_count:
+            completion_message += f"\n\n⚠️ {expected_count - actual_count} files may be missing!"
+        elif expected_count < actual_count:
+            completion_message += f"\n\n⚠️ {actual_count - expected_count} additional files were copied!"
+        else:
+            completion_message += "\n\n✓ All expected files were copied successfully!"
+        
+        # Show completion message
+        messagebox.showinfo("Export Complete", completion_message, parent=root)
+        
+        return True
 
 
 def main():
     """
     Main entry point for the GUI interface.
     """
-    # Select a file
-    file_path = select_file()
-    if not file_path:
-        print("No file selected. Exiting.")
-        return
-    
-    # Get recursion depth
-    max_depth = get_max_depth()
-    
-    # Run the export
-    run_export(file_path, max_depth)
+    # Start Tk once and share its hidden root between all dialogs
+    with _hidden_root() as root:
+        # Select a file
+        file_path = select_file(root)
+        if not file_path:
+            print("No file selected. Exiting.")
+            return
+        
+        # Get recursion depth
+        max_depth = get_max_depth(root)
+        
+        # Run the export
+        run_export(file_path, max_depth, root)
 
 
 if __name__ == "__main__":
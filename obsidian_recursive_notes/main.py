@@ -23,7 +23,7 @@ import os
 import sys
 import shutil
 
-from .path_utils import ensure_str_path, create_export_dir, resolve_path
+from .path_utils import ensure_str_path, create_export_dir, clear_export_dir, resolve_path
 from .file_operations import read_files_recursive
 
 
@@ -63,11 +63,8 @@ def main():
     export_dir = create_export_dir(file_to_find)
     print(f"Path to export folder: {export_dir}\n")
 
-    # Clean up existing export directory if it exists
-    if os.path.exists(export_dir) and os.path.isdir(export_dir):
-        shutil.rmtree(export_dir)
-        os.makedirs(export_dir, exist_ok=True)
-        os.makedirs(os.path.join(export_dir, "notes"), exist_ok=True)
+    # Clean up existing export directory if it exists; the old files are deleted in the background
+    clear_export_dir(export_dir)
 
     # Copy the main file with its original name
     dest_file = os.path.join(export_dir, "notes", os.path.basename(file_to_find))
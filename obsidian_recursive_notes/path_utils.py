@@ -6,10 +6,28 @@ Functions include string conversion, sanitization, and file search.
 """
 
 import os
-import re
+import shutil
+import threading
+import time
+from functools import lru_cache
 from pathlib import Path
 
 
+class _SanitizeTable(dict):
+    """str.translate table that maps every character not listed to '_'."""
+
+    def __missing__(self, key):
+        return '_'
+
+
+# Characters that are safe in exported filenames map to themselves
+_SANITIZE_TABLE = _SanitizeTable(
+    (c, chr(c)) for c in b'abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789._-'
+)
+# Any other ASCII character is replaced; non-ASCII ones fall through to __missing__
+_SANITIZE_TABLE.update((c, '_') for c in range(128) if c not in _SANITIZE_TABLE)
+
+
 def ensure_str_path(path):
     """
     Convert any path object to a string.
@@ -22,53 +40,214 @@ def ensure_str_path(path):
     """
     if path is None:
         return None
-    return str(path) if not isinstance(path, str) else path
+    # Handles str, bytes and os.PathLike objects such as pathlib.Path
+    return os.fsdecode(path)
 
 
+@lru_cache(maxsize=4096)
 def sanitize_filename(filename):
     """
     Convert a filename to a safe format, replacing spaces and special characters.
     
+    The result depends on nothing but the name, so it is cached: the same link
+    targets recur across the notes of a vault.
+    
     Args:
         filename (str): The filename to sanitize
         
     Returns:
         str: Sanitized filename
     """
-    # Remove special characters except for .-_
-    sanitized = re.sub(r'[^a-zA-Z0-9._-]', '_', filename)
-    return sanitized
+    # Replace special characters except for .-_ in a single C-level pass
+    return filename.translate(_SANITIZE_TABLE)
+
+
+def _iter_files(base_directory):
+    """
+    Yield every file below a directory in the order a top-down os.walk visits them.
+    
+    Uses os.scandir directly: DirEntry caches the file type from the directory
+    listing, so regular entries need no extra stat, and callers can stop early.
+    
+    Args:
+        base_directory (str): The directory to walk
+        
+    Yields:
+        os.DirEntry: Each file (or non-directory entry) found
+    """
+    stack = [base_directory]
+    
+    while stack:
+        directory = stack.pop()
+        subdirectories = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    # Like os.walk, symlinked directories are not descended into
+                    if entry.is_dir():
+                        if not entry.is_symlink():
+                            subdirectories.append(entry.path)
+                    else:
+                        yield entry
+        except OSError:
+            continue
+        
+        # Push in reverse so subdirectories are visited in listing order
+        stack.extend(reversed(subdirectories))
+
+
+def build_file_index(base_directory):
+    """
+    Walk a directory tree once and map every filename to the paths it occurs at.
+    
+    Args:
+        base_directory (str): The directory to index
+        
+    Returns:
+        dict: Mapping of filename to a list of normalized paths, in the same
+            order a top-down os.walk would visit them
+    """
+    # Paths joined onto a normalized directory are already normalized themselves
+    file_index = {}
+    for entry in _iter_files(os.path.normpath(base_directory)):
+        file_index.setdefault(entry.name, []).append(entry.path)
+    return file_index
 
 
-def find_file_in_directory(filename, base_directory):
+def _is_inside_without_symlinks(directory, ancestor):
+    """
+    Check that a directory lies below an ancestor without passing through a symlink.
+    
+    Args:
+        directory (str): Absolute, normalized directory path
+        ancestor (str): Absolute, normalized path of a possible ancestor
+        
+    Returns:
+        bool: True if a walk of ancestor also covers everything below directory
+    """
+    if not directory.startswith(os.path.join(ancestor, "")):
+        return False
+    
+    # Walks do not descend into symlinked directories, so their contents are not indexed
+    while directory != ancestor:
+        if os.path.islink(directory):
+            return False
+        directory = os.path.dirname(directory)
+    return True
+
+
+def _get_directory_index(base_directory, file_index):
+    """
+    Return the index of a directory, building it at most once per export run.
+    
+    When an ancestor directory is already indexed, the index is derived from it
+    instead of walking the subtree again, so a vault is read only once.
+    
+    Args:
+        base_directory (str): Absolute directory to index
+        file_index (dict): Per-export cache mapping directories to their indexes
+        
+    Returns:
+        dict: Mapping of filename to a list of normalized paths
+    """
+    directory_index = file_index.get(base_directory)
+    if directory_index is not None:
+        return directory_index
+    
+    for indexed_directory, ancestor_index in file_index.items():
+        if _is_inside_without_symlinks(base_directory, indexed_directory):
+            # A subtree's files keep their relative order in the ancestor's walk
+            prefix = os.path.join(base_directory, "")
+            directory_index = {}
+            for name, paths in ancestor_index.items():
+                matching_paths = [path for path in paths if path.startswith(prefix)]
+                if matching_paths:
+                    directory_index[name] = matching_paths
+            break
+    else:
+        directory_index = build_file_index(base_directory)
+    
+    file_index[base_directory] = directory_index
+    return directory_index
+
+
+def find_file_in_directory(filename, base_directory, file_index=None):
     """
     Find a file by name, first in the given directory, then recursively through subdirectories.
     
     Args:
         filename (str): The name of the file to find
         base_directory (str): The directory to start searching from
+        file_index (dict, optional): Per-export cache mapping directories to their
+            build_file_index() result. When given, each directory tree is walked
+            at most once. Defaults to None.
         
     Returns:
-        str or None: The full path to the found file, or None if not found
+        str or None: The full path to the found file, or None if not found. When a
+            filename occurs more than once, the first match in os.walk order wins,
+            with or without file_index.
     """
-    # Try to find the file in the given directory first
+    # Index entries are keyed and filtered by normalized directory, so "a/./b" and
+    # "a/c/../b" must find the same files as "a/b"
+    base_directory = os.path.normpath(base_directory)
+    
+    # Try to find the file in the given directory first; the path is only
+    # normalized once it is known to exist
     potential_path = os.path.join(base_directory, filename)
-    potential_path = os.path.normpath(potential_path)
+    
+    # A plain filename can be answered from the index without a stat: the walk lists
+    # the directory's own files first, so a file directly inside it is candidates[0]
+    if file_index is not None and os.path.basename(filename) == filename:
+        candidates = _get_directory_index(base_directory, file_index).get(filename)
+        if candidates:
+            return candidates[0]
+        # The index matches names exactly, so stat once for case-insensitive filesystems
+        return os.path.normpath(potential_path) if os.path.exists(potential_path) else None
     
     if os.path.exists(potential_path):
-        return potential_path
+        return os.path.normpath(potential_path)
+    
+    # If not found, look it up in the (lazily built) index of this directory
+    if file_index is not None:
+        candidates = _get_directory_index(base_directory, file_index).get(filename)
+        return candidates[0] if candidates else None
         
-    # If not found, search recursively
-    for root, _, files in os.walk(base_directory):
-        for file in files:
-            if file == filename:
-                file_path = os.path.join(root, file)
-                return os.path.normpath(file_path)
+    # If not found, search recursively, stopping at the first match
+    for entry in _iter_files(base_directory):
+        if entry.name == filename:
+            return os.path.normpath(entry.path)
                 
     # File not found
     return None
 
 
+def find_file_cached(filename, base_directory, file_index=None, lookup_cache=None):
+    """
+    Find a file like find_file_in_directory(), remembering the result per export.
+    
+    Args:
+        filename (str): The name of the file to find
+        base_directory (str): The directory to start searching from
+        file_index (dict, optional): Per-export directory index cache. Defaults to None.
+        lookup_cache (dict, optional): Per-export cache mapping (filename, directory)
+            to the found path or None. Misses are cached too, so links to a missing
+            note are looked up once per directory. Defaults to None.
+        
+    Returns:
+        str or None: The full path to the found file, or None if not found
+    """
+    if lookup_cache is None:
+        return find_file_in_directory(filename, base_directory, file_index)
+    
+    lookup_key = (filename, base_directory)
+    if lookup_key in lookup_cache:
+        return lookup_cache[lookup_key]
+    
+    found_path = find_file_in_directory(filename, base_directory, file_index)
+    lookup_cache[lookup_key] = found_path
+    return found_path
+
+
 def resolve_path(file_path):
     """
     Resolve a file path, handling both relative and absolute paths.
@@ -115,8 +294,60 @@ def create_export_dir(file_path, base_dir=None):
         
     export_dir = os.path.join(base_dir, original_name)
     
-    # Create the export directory structure
-    os.makedirs(export_dir, exist_ok=True)
+    # Create the export directory structure; creating notes/ creates export_dir too
     os.makedirs(os.path.join(export_dir, "notes"), exist_ok=True)
     
-    return export_dir 
\ No newline at end of file
+    return export_dir 
+
+
+def _holds_previous_export(export_dir):
+    """
+    Check whether a directory holds anything besides an empty notes directory.
+    
+    Args:
+        export_dir (str): Path to an existing export directory
+        
+    Returns:
+        bool: True if there are files of an earlier export to clear
+    """
+    try:
+        names = os.listdir(export_dir)
+        if not names:
+            return False
+        return names != ["notes"] or bool(os.listdir(os.path.join(export_dir, "notes")))
+    except OSError:
+        # E.g. "notes" is a file; clear the directory so it can be recreated
+        return True
+
+
+def clear_export_dir(export_dir):
+    """
+    Empty an export directory left by a previous run, leaving a fresh notes directory.
+    
+    The old export is renamed aside and deleted on a background thread, so a new
+    export can start without waiting for every old file to be removed. A directory
+    just made by create_export_dir() has nothing to clear and is left as it is.
+    
+    Args:
+        export_dir (str): Path to the export directory
+        
+    Returns:
+        threading.Thread or None: The thread deleting the old export, if one was started
+    """
+    deletion = None
+    
+    if os.path.isdir(export_dir) and _holds_previous_export(export_dir):
+        parent_dir, name = os.path.split(os.path.normpath(export_dir))
+        trash_dir = os.path.join(parent_dir, f".{name}.old-{time.time_ns()}")
+        try:
+            os.rename(export_dir, trash_dir)
+        except OSError:
+            # Renaming fails e.g. while a file is open on Windows; delete in place instead
+            shutil.rmtree(export_dir)
+        else:
+            # Not a daemon thread, so the interpreter finishes the deletion before exiting
+            deletion = threading.Thread(target=shutil.rmtree, args=(trash_dir,), kwargs={"ignore_errors": True})
+            deletion.start()
+    
+    os.makedirs(os.path.join(export_dir, "notes"), exist_ok=True)
+    return deletion
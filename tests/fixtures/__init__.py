@@ -0,0 +1,29 @@
+"""
+Shared test fixtures
+"""
+
+import os
+import tempfile
+from pathlib import Path
+
+from .vault_contents import VAULT_FILES
+
+
+def fast_tmpdir():
+    """Create a temporary directory, in RAM-backed /dev/shm when the system has it"""
+    if os.path.isdir("/dev/shm") and os.access("/dev/shm", os.W_OK):
+        return tempfile.mkdtemp(dir="/dev/shm")
+    return tempfile.mkdtemp()
+
+
+def write_vault(directory):
+    """Write the sample vault into a directory and return the path of its main note"""
+    file_paths = {Path(directory, rel_path): data for rel_path, data in VAULT_FILES.items()}
+    
+    # Create each directory once, then write the files
+    for parent in {file_path.parent for file_path in file_paths}:
+        parent.mkdir(parents=True, exist_ok=True)
+    for file_path, data in file_paths.items():
+        file_path.write_bytes(data)
+    
+    return os.path.join(directory, "main.md")
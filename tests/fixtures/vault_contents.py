@@ -0,0 +1,82 @@
+"""
+Test Vault Contents
+
+The notes and images of the sample vault shared by the tests and the manual
+test script, keyed by their path relative to the vault root.
+"""
+
+# Main file with links to other files and images
+MAIN_CONTENT = b"""# Main Test File
+
+This is a test file with links to other markdown files and images.
+
+## Links to Markdown Files
+- Regular link: [[note1]]
+- Link with extension: [[note2.md]]
+- Link with anchor: [[note3#section]]
+- Link with alias: [[note4|Alias for Note 4]]
+- Link to subfolder: [[subfolder/subnote1]]
+
+## Links to Images
+- Standard image: ![[test_image.png]]
+- Image in subfolder: ![[images/test_image2.jpg]]
+
+## External Links
+- [External Link](https://example.com)
+"""
+
+# Note 1 with circular link back to main
+NOTE1_CONTENT = b"""# Note 1
+
+This is Note 1 with a link back to [[main]].
+
+It also has a new link to [[note5]].
+"""
+
+# Note 2 with no links
+NOTE2_CONTENT = b"""# Note 2
+
+This file has no links to other files.
+"""
+
+# Note 3 with links and an image
+NOTE3_CONTENT = b"""# Note 3
+
+## Section
+
+This file has a section and links to [[note2]] and an image ![[test_image.png]].
+"""
+
+# Note 4 with a self-reference
+NOTE4_CONTENT = b"""# Note 4
+
+This file has a self-reference link: [[#section]].
+
+## Section
+Content in section.
+"""
+
+# Note 5 with link to non-existent file
+NOTE5_CONTENT = b"""# Note 5
+
+This file has a link to a [[non-existent-file]] that doesn't exist.
+"""
+
+# Subnote 1 in subfolder
+SUBNOTE1_CONTENT = b"""# Subnote 1
+
+This file is in a subfolder and links to [[../note1]].
+"""
+
+# Every file of the vault, images included
+VAULT_FILES = {
+    "main.md": MAIN_CONTENT,
+    "note1.md": NOTE1_CONTENT,
+    "note2.md": NOTE2_CONTENT,
+    "note3.md": NOTE3_CONTENT,
+    "note4.md": NOTE4_CONTENT,
+    "note5.md": NOTE5_CONTENT,
+    "subfolder/subnote1.md": SUBNOTE1_CONTENT,
+    "test_image.png": b"PNG TEST",
+    "images/test_image2.jpg": b"JPG TEST",
+}
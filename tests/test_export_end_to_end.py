@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Test Export End To End
+
+This script runs the full export on a sample vault, with the message boxes
+patched out, and checks the files that end up in the export directory.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import unittest
+from unittest import mock
+
+# Import the modules to test
+from obsidian_recursive_notes import path_utils
+from obsidian_recursive_notes.gui_interface import run_export
+from tests.fixtures import fast_tmpdir, write_vault
+
+
+class TestExportEndToEnd(unittest.TestCase):
+    """End-to-end test cases for run_export"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the sample vault once for every depth"""
+        cls.test_dir = fast_tmpdir()
+        cls.main_file = write_vault(cls.test_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up temporary test files"""
+        shutil.rmtree(cls.test_dir)
+
+    def test_run_export(self):
+        """Test that the export copies the linked files for each depth limit"""
+        # main.md, note1-5.md, subnote1.md and both images; depth 1 misses note5.md
+        cases = [(None, 9), (1, 8), (0, 1)]
+        for max_depth, expected in cases:
+            with self.subTest(max_depth=max_depth):
+                # Export next to the vault rather than to the desktop
+                export_base = fast_tmpdir()
+                self.addCleanup(shutil.rmtree, export_base)
+
+                # Wait for any background deletion before the cleanup removes export_base
+                deletions = []
+
+                def clear_export_dir(export_dir):
+                    deletion = path_utils.clear_export_dir(export_dir)
+                    if deletion is not None:
+                        self.addCleanup(deletion.join)
+                        deletions.append(deletion)
+                    return deletion
+
+                with mock.patch("obsidian_recursive_notes.gui_interface.create_export_dir",
+                                lambda file_path: path_utils.create_export_dir(file_path, base_dir=export_base)), \
+                        mock.patch("obsidian_recursive_notes.gui_interface.clear_export_dir", clear_export_dir), \
+                        mock.patch("tkinter.messagebox.showinfo") as showinfo, \
+                        mock.patch("tkinter.messagebox.showerror") as showerror, \
+                        contextlib.redirect_stdout(io.StringIO()):
+                    result = run_export(self.main_file, max_depth=max_depth, root=mock.MagicMock())
+
+                self.assertTrue(result)
+                showerror.assert_not_called()
+                self.assertIn("All expected files were copied", showinfo.call_args[0][1])
+                self.assertEqual(len(os.listdir(os.path.join(export_base, "main", "notes"))), expected)
+                self.assertEqual(deletions, [], "A fresh export directory has nothing to delete")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,145 +6,78 @@ This script tests the file counting logic in the Obsidian Recursive Notes export
 by creating test files with various link structures and validating the count.
 """
 
+import contextlib
+import io
 import os
 import shutil
-import tempfile
 import unittest
 from pathlib import Path
+from unittest import mock
 
 # Import the modules to test
 from obsidian_recursive_notes.gui_interface import count_expected_links
+from obsidian_recursive_notes import file_operations
+from obsidian_recursive_notes import path_utils
 from obsidian_recursive_notes.file_operations import read_files_recursive
+from tests.fixtures import fast_tmpdir, write_vault
+
+# Note with non-ASCII text around its link, encoded once
+UNICODE_CONTENT = """# Unicode Test
+
+This file has a link to [[note1]] and Unicode characters: ü, файл, 漢字.
+""".encode("utf-8")
 
 
 class TestFileCounting(unittest.TestCase):
     """Test cases for file counting logic"""
 
-    def setUp(self):
-        """Set up test environment with test files"""
+    @classmethod
+    def setUpClass(cls):
+        """Set up the test vault once; tests must not modify it"""
         # Create a temporary directory for test files
-        self.test_dir = tempfile.mkdtemp()
-        self.files_copied = []
-        
-        # Create test directory structure
-        os.makedirs(os.path.join(self.test_dir, "images"), exist_ok=True)
-        os.makedirs(os.path.join(self.test_dir, "subfolder"), exist_ok=True)
+        cls.test_dir = fast_tmpdir()
         
         # Create test files
-        self.create_test_files()
+        cls.create_test_files()
         
-    def tearDown(self):
+    @classmethod
+    def tearDownClass(cls):
         """Clean up temporary test files"""
-        shutil.rmtree(self.test_dir)
-        
-    def create_test_files(self):
+        shutil.rmtree(cls.test_dir)
+        
+    def make_temp_dir(self):
+        """Create a scratch directory that is removed after the test"""
+        temp_dir = fast_tmpdir()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        return temp_dir
+        
+    def copy_vault(self):
+        """Copy the test vault for a test that adds notes to it and return the copy's path"""
+        vault_dir = os.path.join(self.make_temp_dir(), "vault")
+        shutil.copytree(self.test_dir, vault_dir)
+        return vault_dir
+        
+    @classmethod
+    def create_test_files(cls):
         """Create test files with various link structures"""
-        # Main file with links to other files and images
-        main_content = """# Main Test File
-        
-This is a test file with links to other markdown files and images.
-
-## Links to Markdown Files
-- Regular link: [[note1]]
-- Link with extension: [[note2.md]]
-- Link with anchor: [[note3#section]]
-- Link with alias: [[note4|Alias for Note 4]]
-- Link to subfolder: [[subfolder/subnote1]]
-
-## Links to Images
-- Standard image: ![[test_image.png]]
-- Image in subfolder: ![[images/test_image2.jpg]]
-
-## External Links
-- [External Link](https://example.com)
-"""
-        
-        # Note 1 with circular link back to main
-        note1_content = """# Note 1
-        
-This is Note 1 with a link back to [[main]].
-
-It also has a new link to [[note5]].
-"""
-        
-        # Note 2 with no links
-        note2_content = """# Note 2
-        
-This file has no links to other files.
-"""
-        
-        # Note 3 with links and an image
-        note3_content = """# Note 3
-
-## Section
-
-This file has a section and links to [[note2]] and an image ![[test_image.png]].
-"""
-        
-        # Note 4 with a self-reference
-        note4_content = """# Note 4
-        
-This file has a self-reference link: [[#section]].
-
-## Section
-Content in section.
-"""
-        
-        # Note 5 with link to non-existent file
-        note5_content = """# Note 5
-        
-This file has a link to a [[non-existent-file]] that doesn't exist.
-"""
-        
-        # Subnote 1 in subfolder
-        subnote1_content = """# Subnote 1
-        
-This file is in a subfolder and links to [[../note1]].
-"""
-        
-        # Write files
-        self.main_file = os.path.join(self.test_dir, "main.md")
-        with open(self.main_file, "w") as f:
-            f.write(main_content)
-            
-        with open(os.path.join(self.test_dir, "note1.md"), "w") as f:
-            f.write(note1_content)
-            
-        with open(os.path.join(self.test_dir, "note2.md"), "w") as f:
-            f.write(note2_content)
-            
-        with open(os.path.join(self.test_dir, "note3.md"), "w") as f:
-            f.write(note3_content)
-            
-        with open(os.path.join(self.test_dir, "note4.md"), "w") as f:
-            f.write(note4_content)
-            
-        with open(os.path.join(self.test_dir, "note5.md"), "w") as f:
-            f.write(note5_content)
-            
-        with open(os.path.join(self.test_dir, "subfolder", "subnote1.md"), "w") as f:
-            f.write(subnote1_content)
-            
-        # Create image files
-        with open(os.path.join(self.test_dir, "test_image.png"), "wb") as f:
-            f.write(b"PNG TEST")
-            
-        with open(os.path.join(self.test_dir, "images", "test_image2.jpg"), "wb") as f:
-            f.write(b"JPG TEST")
+        cls.main_file = write_vault(cls.test_dir)
     
-    def test_expected_links_no_depth_limit(self):
-        """Test counting expected links with no depth limit"""
+    def test_expected_counts(self):
+        """Test counting expected links with and without a depth limit"""
+        # - No limit: main.md, note1.md through note5.md, subfolder/subnote1.md and both images
+        # - Depth 0: only the main file
+        # - Depth 1: main.md + note1-4.md + subfolder/subnote1.md + 2 images
+        cases = [(None, 9), (0, 1), (1, 8)]
+        for max_depth, expected in cases:
+            with self.subTest(max_depth=max_depth):
+                expected_count, visited = count_expected_links(self.main_file, max_depth=max_depth)
+                self.assertEqual(expected_count, expected, f"Expected {expected} files, got {expected_count}")
+                self.assertEqual(len(visited), expected, f"Expected {expected} files in visited set, got {len(visited)}")
+    
+    def test_expected_links_visited_files(self):
+        """Test that every linked file ends up in the visited set"""
         expected_count, visited = count_expected_links(self.main_file)
         
-        # We expect 9 files: 
-        # - main.md
-        # - note1.md through note5.md (5 files)
-        # - subfolder/subnote1.md
-        # - test_image.png
-        # - images/test_image2.jpg
-        self.assertEqual(expected_count, 9, f"Expected 9 files, got {expected_count}")
-        
-        # Check that all expected files are in the visited set
         expected_files = [
             "main.md", "note1.md", "note2.md", "note3.md", "note4.md", "note5.md", 
             "subfolder/subnote1.md", "test_image.png", "images/test_image2.jpg"
@@ -153,60 +86,160 @@ This file is in a subfolder and links to [[../note1]].
             file_path = os.path.join(self.test_dir, file.replace("/", os.sep))
             self.assertIn(file_path, visited, f"File {file} should be in visited set")
     
-    def test_expected_links_depth_0(self):
-        """Test counting expected links with depth limit 0"""
-        expected_count, visited = count_expected_links(self.main_file, max_depth=0)
-        
-        # At depth 0, we expect only the main file
-        self.assertEqual(expected_count, 1, f"Expected 1 file, got {expected_count}")
-        self.assertEqual(len(visited), 1, f"Expected 1 file in visited set, got {len(visited)}")
-    
-    def test_expected_links_depth_1(self):
-        """Test counting expected links with depth limit 1"""
-        expected_count, visited = count_expected_links(self.main_file, max_depth=1)
-        
-        # At depth 1, we expect main file + directly linked files/images
-        # main.md + note1-4.md + subfolder/subnote1.md + 2 images = 8 files
-        self.assertEqual(expected_count, 8, f"Expected 8 files, got {expected_count}")
-    
     def test_read_files_recursive_consistency(self):
         """Test consistency between expected count and actual copied files"""
         # First get the expected count
         expected_count, visited_files = count_expected_links(self.main_file)
         
-        # Print the visited files for debugging
-        print("\nExpected files to be copied:")
-        for file_path in visited_files:
-            print(f"  - {os.path.basename(file_path)}")
-        
         # Set up export directory
-        export_dir = os.path.join(self.test_dir, "export")
-        os.makedirs(export_dir, exist_ok=True)
+        export_dir = os.path.join(self.make_temp_dir(), "export")
         os.makedirs(os.path.join(export_dir, "notes"), exist_ok=True)
         
-        # Copy the main file
-        shutil.copyfile(self.main_file, os.path.join(export_dir, "notes", os.path.basename(self.main_file)))
+        # Hard-link the main file; the test never writes to it. Copy when linking is not possible
+        exported_main_file = os.path.join(export_dir, "notes", os.path.basename(self.main_file))
+        try:
+            os.link(self.main_file, exported_main_file)
+        except OSError:
+            shutil.copyfile(self.main_file, exported_main_file)
         files_copied = [self.main_file]
         
         # Process files
-        read_files_recursive(
-            self.main_file,
-            export_dir=export_dir,
-            files_already_copied=files_copied
-        )
-        
-        # Print the actually copied files for debugging
-        print("\nActually copied files:")
-        for file_path in files_copied:
-            print(f"  - {os.path.basename(file_path)}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            read_files_recursive(
+                self.main_file,
+                export_dir=export_dir,
+                files_already_copied=files_copied
+            )
         
         # Check if the counts match
         self.assertEqual(len(files_copied), expected_count, 
                         f"Expected {expected_count} files, but copied {len(files_copied)}")
         
         # Check that each visited file is in the files_copied list
-        for file_path in visited_files:
-            self.assertIn(file_path, files_copied, f"File {file_path} should be in files_copied")
+        missing = set(visited_files) - set(files_copied)
+        self.assertFalse(missing, f"Files {missing} should be in files_copied")
+    
+    def test_read_files_recursive_depth_consistency(self):
+        """Test that depth-limited exports copy exactly the files counted for that depth"""
+        for max_depth in (0, 1, 2):
+            with self.subTest(max_depth=max_depth):
+                expected_count, visited_files = count_expected_links(self.main_file, max_depth=max_depth)
+                
+                export_dir = os.path.join(self.make_temp_dir(), "export")
+                files_copied = [self.main_file]
+                with contextlib.redirect_stdout(io.StringIO()):
+                    read_files_recursive(
+                        self.main_file,
+                        max_depth=max_depth,
+                        export_dir=export_dir,
+                        files_already_copied=files_copied
+                    )
+                
+                self.assertEqual(sorted(files_copied), sorted(visited_files))
+                self.assertEqual(len(os.listdir(os.path.join(export_dir, "notes"))), expected_count)
+    
+    def test_read_files_recursive_reuses_link_graph(self):
+        """Test that links resolved while counting are not looked up again during export"""
+        link_graph = {}
+        expected_count, visited_files = count_expected_links(self.main_file, graph=link_graph)
+        
+        export_dir = os.path.join(self.make_temp_dir(), "export")
+        files_copied = [self.main_file]
+        
+        with mock.patch.object(path_utils, "find_file_in_directory") as find_file, \
+                contextlib.redirect_stdout(io.StringIO()):
+            read_files_recursive(
+                self.main_file,
+                export_dir=export_dir,
+                files_already_copied=files_copied,
+                graph=link_graph
+            )
+        
+        find_file.assert_not_called()
+        self.assertEqual(sorted(files_copied), sorted(visited_files))
+    
+    def create_chain(self, chain_length):
+        """Create chain0 -> chain1 -> ... and return the path of the first note"""
+        chain_dir = self.make_temp_dir()
+        
+        for i in range(chain_length):
+            with open(os.path.join(chain_dir, f"chain{i}.md"), "w") as f:
+                f.write(f"# Chain {i}\n\nNext: [[chain{i + 1}]]\n" if i + 1 < chain_length else "# End\n")
+        
+        return os.path.join(chain_dir, "chain0.md")
+    
+    def test_expected_links_deep_chain(self):
+        """Test that counting long chains of links does not hit the recursion limit"""
+        first_file = self.create_chain(2000)
+        
+        expected_count, visited = count_expected_links(first_file)
+        self.assertEqual(expected_count, 2000)
+        
+        expected_count, visited = count_expected_links(first_file, max_depth=10)
+        self.assertEqual(expected_count, 11, "Depth 10 should count the first note and 10 more")
+    
+    def create_wide_vault(self, note_count):
+        """Create main.md linking to note_count other notes and return its path"""
+        vault_dir = self.make_temp_dir()
+        for i in range(note_count):
+            with open(os.path.join(vault_dir, f"note{i}.md"), "wb") as f:
+                f.write(b"# Note\n")
+        main_file = os.path.join(vault_dir, "main.md")
+        with open(main_file, "w") as f:
+            f.write("".join(f"[[note{i}]]\n" for i in range(note_count)))
+        return main_file
+    
+    def test_large_vault_parsed_once(self):
+        """Test that counting and exporting a vault of thousands of notes read each note once"""
+        note_count = 5000
+        main_file = self.create_wide_vault(note_count)
+        
+        file_index, link_graph, lookup_cache = {}, {}, {}
+        file_operations.clear_link_cache()
+        count_expected_links(main_file, file_index=file_index, graph=link_graph, lookup_cache=lookup_cache)
+        with contextlib.redirect_stdout(io.StringIO()):
+            read_files_recursive(
+                main_file,
+                export_dir=os.path.join(self.make_temp_dir(), "export"),
+                files_already_copied=[main_file],
+                file_index=file_index,
+                graph=link_graph,
+                lookup_cache=lookup_cache
+            )
+        
+        self.assertEqual(file_operations._parse_links_cached.cache_info().misses, note_count + 1)
+    
+    def test_large_level_prefetched_once(self):
+        """Test that prefetching a level of thousands of notes does not make the export read them again"""
+        # Each note links back to main.md, so the second level is read as well
+        note_count = 5000
+        main_file = self.create_wide_vault(note_count)
+        for i in range(note_count):
+            with open(os.path.join(os.path.dirname(main_file), f"note{i}.md"), "wb") as f:
+                f.write(b"[[main]]\n")
+        
+        file_operations.clear_link_cache()
+        with contextlib.redirect_stdout(io.StringIO()):
+            read_files_recursive(
+                main_file,
+                export_dir=os.path.join(self.make_temp_dir(), "export"),
+                files_already_copied=[main_file]
+            )
+        
+        self.assertEqual(file_operations._parse_links_cached.cache_info().misses, note_count + 1)
+    
+    def test_read_files_recursive_deep_chain(self):
+        """Test that long chains of links do not hit the recursion limit"""
+        chain_length = 500
+        first_file = self.create_chain(chain_length)
+        export_dir = os.path.join(self.make_temp_dir(), "export")
+        files_copied = [first_file]
+        
+        with contextlib.redirect_stdout(io.StringIO()):
+            read_files_recursive(first_file, export_dir=export_dir, files_already_copied=files_copied)
+        
+        self.assertEqual(len(files_copied), chain_length)
+        self.assertEqual(len(os.listdir(os.path.join(export_dir, "notes"))), chain_length)
     
     def test_circular_reference_handling(self):
         """Test handling of circular references (main -> note1 -> main)"""
@@ -229,10 +262,23 @@ This file is in a subfolder and links to [[../note1]].
         self.assertEqual(expected_count, 1, 
                         f"Expected 1 file, got {expected_count} (non-existent file should not be counted)")
     
+    def test_missing_targets_looked_up_once(self):
+        """Test that links to a missing note are only looked up once per directory"""
+        stub_file_path = os.path.join(self.make_temp_dir(), "stubs.md")
+        with open(stub_file_path, "w", encoding="utf-8") as f:
+            f.write("[[missing]] and [[missing#heading]] and [[missing|alias]]\n")
+        
+        with mock.patch.object(path_utils, "find_file_in_directory",
+                               wraps=path_utils.find_file_in_directory) as find_file:
+            expected_count, visited = count_expected_links(stub_file_path)
+        
+        self.assertEqual(expected_count, 1)
+        self.assertEqual(find_file.call_count, 1)
+    
     def test_empty_file_handling(self):
         """Test handling of empty files"""
         # Create an empty file
-        empty_file_path = os.path.join(self.test_dir, "empty.md")
+        empty_file_path = os.path.join(self.make_temp_dir(), "empty.md")
         with open(empty_file_path, "w") as f:
             pass
         
@@ -243,24 +289,51 @@ This file is in a subfolder and links to [[../note1]].
         self.assertEqual(expected_count, 1, 
                         f"Expected 1 file, got {expected_count} (empty file should be counted as 1)")
     
+    def test_edited_file_is_parsed_again(self):
+        """Test that cached link parses do not outlive an edit of the note"""
+        note_path = os.path.join(self.copy_vault(), "edited.md")
+        with open(note_path, "w", encoding="utf-8") as f:
+            f.write("# Edited!\n")
+        
+        expected_count, visited = count_expected_links(note_path)
+        self.assertEqual(expected_count, 1)
+        
+        # Same size is not enough to hit the cache once the modification time changes
+        with open(note_path, "w", encoding="utf-8") as f:
+            f.write("[[note1]]\n")
+        stat = os.stat(note_path)
+        os.utime(note_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+        
+        expected_count, visited = count_expected_links(note_path, max_depth=1)
+        self.assertEqual(expected_count, 2, "The edited note should have been parsed again")
+    
+    def test_large_file_handling(self):
+        """Test that links are found in notes large enough to be memory-mapped"""
+        large_file_path = os.path.join(self.copy_vault(), "large.md")
+        with open(large_file_path, "w", encoding="utf-8") as f:
+            f.write("Filler text without links.\n" * 50000)
+            f.write("Finally a link to [[note1]] and ![[test_image.png]].\n")
+        
+        expected_count, visited = count_expected_links(large_file_path, max_depth=1)
+        
+        # The large note, note1 and the image should be counted
+        self.assertEqual(expected_count, 3, 
+                        f"Expected 3 files, got {expected_count} (large file handling issue)")
+    
     def test_unicode_handling(self):
         """Test handling of files with Unicode characters"""
         # Create a new temp directory for this test to avoid conflicts
-        unicode_test_dir = tempfile.mkdtemp()
+        unicode_test_dir = fast_tmpdir()
         try:
             # Create a file with Unicode characters
             unicode_file_path = os.path.join(unicode_test_dir, "unicode-файл.md")
-            unicode_content = """# Unicode Test
-            
-This file has a link to [[note1]] and Unicode characters.
-"""
-            with open(unicode_file_path, "w", encoding="utf-8") as f:
-                f.write(unicode_content)
+            with open(unicode_file_path, "wb") as f:
+                f.write(UNICODE_CONTENT)
             
             # Create the note1 file
             note1_path = os.path.join(unicode_test_dir, "note1.md")
-            with open(note1_path, "w", encoding="utf-8") as f:
-                f.write("# Note 1\n\nTest file for Unicode test.")
+            with open(note1_path, "wb") as f:
+                f.write(b"# Note 1\n\nTest file for Unicode test.")
             
             # Count expected links
             expected_count, visited = count_expected_links(unicode_file_path)
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Test File Operations
+
+This script tests copying linked files into the export in the Obsidian Recursive Notes exporter.
+"""
+
+import contextlib
+import io
+import os
+import shutil
+import unittest
+
+# Import the modules to test
+from obsidian_recursive_notes.file_operations import (
+    copy_file_to_export, find_image_links, find_markdown_links, link_target, read_files_recursive
+)
+from tests.fixtures import fast_tmpdir, write_vault
+
+
+class TestLinkTarget(unittest.TestCase):
+    """Test cases for turning link text into the file to look up"""
+
+    def test_link_targets(self):
+        """Test that anchors and aliases are stripped and note links get .md"""
+        cases = [
+            ("note", False, "note.md"),
+            ("note.md", False, "note.md"),
+            ("note#section", False, "note.md"),
+            ("note|Alias", False, "note.md"),
+            ("sub/note#section|Alias", False, "sub/note.md"),
+            ("#section", False, ""),
+            ("image.png|100", True, "image.png"),
+            ("note", True, "note"),
+        ]
+        for file_link, is_image, expected in cases:
+            with self.subTest(file_link=file_link, is_image=is_image):
+                self.assertEqual(link_target(file_link, is_image), expected)
+
+
+class TestLinkHelpers(unittest.TestCase):
+    """Test cases for the public per-link export helpers"""
+
+    @classmethod
+    def setUpClass(cls):
+        """Set up the sample vault once; tests only export from it"""
+        cls.test_dir = fast_tmpdir()
+        cls.main_file = write_vault(cls.test_dir)
+
+    @classmethod
+    def tearDownClass(cls):
+        """Clean up temporary test files"""
+        shutil.rmtree(cls.test_dir)
+
+    def setUp(self):
+        """Set up an empty export directory"""
+        self.export_dir = os.path.join(fast_tmpdir(), "export")
+        self.addCleanup(shutil.rmtree, os.path.dirname(self.export_dir))
+        self.files_copied = [self.main_file]
+
+    def exported_files(self):
+        """Return the sorted names of the files in the export's notes directory"""
+        notes_dir = os.path.join(self.export_dir, "notes")
+        return sorted(os.listdir(notes_dir)) if os.path.isdir(notes_dir) else []
+
+    def test_copy_file_to_export(self):
+        """Test that a found file is copied and recorded once, and a missing one is skipped"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            for _ in range(2):
+                self.assertEqual(
+                    copy_file_to_export("note1.md", self.main_file, export_dir=self.export_dir,
+                                        files_already_copied=self.files_copied),
+                    "note1.md"
+                )
+            self.assertIsNone(copy_file_to_export("missing.md", self.main_file, export_dir=self.export_dir,
+                                                  files_already_copied=self.files_copied))
+
+        self.assertEqual(self.exported_files(), ["note1.md"])
+        self.assertEqual(self.files_copied, [self.main_file, os.path.join(self.test_dir, "note1.md")])
+
+    def test_copy_file_to_export_traverse(self):
+        """Test that traversing exports the notes linked from the copied note"""
+        with contextlib.redirect_stdout(io.StringIO()):
+            copy_file_to_export("note1.md", self.main_file, traverse=True, export_dir=self.export_dir,
+                                files_already_copied=self.files_copied)
+
+        # note1 links back to main (already exported) and on to note5
+        self.assertEqual(self.exported_files(), ["note1.md", "note5.md"])
+
+    def test_find_markdown_links(self):
+        """Test that note links in a line are exported down to the depth limit"""
+        line = "See [[note3#section]], [[note3|again]] and ![[test_image.png]]\n"
+        cases = [(0, []), (1, ["note3.md"]), (None, ["note2.md", "note3.md", "test_image.png"])]
+        for max_depth, expected in cases:
+            with self.subTest(max_depth=max_depth):
+                export_dir = os.path.join(self.export_dir, str(max_depth))
+                with contextlib.redirect_stdout(io.StringIO()):
+                    result = find_markdown_links(line, self.main_file, export_dir=export_dir,
+                                                 files_already_copied=[self.main_file], max_depth=max_depth)
+
+                self.assertEqual(result, line)
+                notes_dir = os.path.join(export_dir, "notes")
+                self.assertEqual(sorted(os.listdir(notes_dir)) if os.path.isdir(notes_dir) else [], expected)
+
+    def test_find_image_links(self):
+        """Test that every embed is counted and each found image is copied once"""
+        line = "![[test_image.png]] ![[test_image.png|small]] ![[missing.png]] [[note1]]"
+        with contextlib.redirect_stdout(io.StringIO()):
+            count = find_image_links(line, self.main_file, export_dir=self.export_dir,
+                                     files_already_copied=self.files_copied)
+
+        self.assertEqual(count, 3)
+        self.assertEqual(self.exported_files(), ["test_image.png"])
+
+
+class TestExportCopies(unittest.TestCase):
+    """Test cases for the files written into the export"""
+
+    def setUp(self):
+        """Set up a scratch directory"""
+        self.test_dir = fast_tmpdir()
+
+    def tearDown(self):
+        """Clean up temporary test files"""
+        shutil.rmtree(self.test_dir)
+
+    def write_file(self, rel_path, data):
+        """Write a file below the scratch directory and return its path"""
+        file_path = os.path.join(self.test_dir, rel_path.replace("/", os.sep))
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(data)
+        return file_path
+
+    def test_export_overwrites_same_size_file(self):
+        """Test that a newer export replaces a same-sized, newer-looking file from an earlier one"""
+        export_dir = os.path.join(self.test_dir, "out")
+        first_main = self.write_file("v1/main.md", b"![[pic.png]]\n")
+        self.write_file("v1/pic.png", b"AAAA")
+        second_main = self.write_file("v2/main.md", b"![[pic.png]]\n")
+        second_pic = self.write_file("v2/pic.png", b"BBBB")
+
+        # The second vault's image is older than the copy the first export leaves behind
+        os.utime(second_pic, ns=(0, 0))
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            read_files_recursive(first_main, export_dir=export_dir, files_already_copied=[first_main])
+            read_files_recursive(second_main, export_dir=export_dir, files_already_copied=[second_main])
+
+        with open(os.path.join(export_dir, "notes", "pic.png"), "rb") as f:
+            self.assertEqual(f.read(), b"BBBB")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -60,6 +60,7 @@ class TestGUIInterface(unittest.TestCase):
         self.assertIsNone(max_depth)
 
     @patch('obsidian_recursive_notes.gui_interface.read_files_recursive')
+    @patch('obsidian_recursive_notes.gui_interface.clear_export_dir')
     @patch('obsidian_recursive_notes.gui_interface.create_export_dir')
     @patch('obsidian_recursive_notes.gui_interface.resolve_path')
     @patch('obsidian_recursive_notes.gui_interface.ensure_str_path')
@@ -75,7 +76,7 @@ class TestGUIInterface(unittest.TestCase):
     def test_run_export(self, mock_showerror, mock_showinfo, mock_create_root, mock_count_links, 
                        mock_copyfile, mock_makedirs, mock_rmtree, mock_isdir, 
                        mock_exists, mock_ensure_str_path, mock_resolve_path, 
-                       mock_create_export_dir, mock_read_files_recursive):
+                       mock_create_export_dir, mock_clear_export_dir, mock_read_files_recursive):
         """Test that the run_export function calls the correct functions with the right arguments."""
         # Set up mocks
         mock_root = MagicMock()
@@ -98,6 +99,7 @@ class TestGUIInterface(unittest.TestCase):
         self.assertTrue(result)
         mock_resolve_path.assert_called_once_with(file_path)
         mock_create_export_dir.assert_called_once_with(file_path)
+        mock_clear_export_dir.assert_called_once_with(export_dir)
         mock_read_files_recursive.assert_called_once()
         
         # Test when resolve_path returns an error
@@ -105,6 +107,24 @@ class TestGUIInterface(unittest.TestCase):
         result = run_export(file_path, max_depth=2)
         self.assertFalse(result)
 
+    @patch('obsidian_recursive_notes.gui_interface.create_hidden_root')
+    @patch('tkinter.simpledialog.askinteger')
+    @patch('tkinter.filedialog.askopenfilename')
+    def test_dialogs_reuse_given_root(self, mock_askopenfilename, mock_askinteger, mock_create_root):
+        """Test that dialogs use a root window passed in instead of starting Tk again."""
+        root = MagicMock()
+        mock_askopenfilename.return_value = "/path/to/test.md"
+        mock_askinteger.return_value = 1
+
+        self.assertEqual(select_file(root), "/path/to/test.md")
+        self.assertEqual(get_max_depth(root), 1)
+
+        # The shared root is neither recreated nor destroyed by the dialogs
+        mock_create_root.assert_not_called()
+        root.destroy.assert_not_called()
+        self.assertIs(mock_askopenfilename.call_args[1]['parent'], root)
+        self.assertIs(mock_askinteger.call_args[1]['parent'], root)
+
 
 if __name__ == '__main__':
     unittest.main() 
\ No newline at end of file
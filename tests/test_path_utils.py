@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Test Path Utilities
+
+This script tests the file lookup helpers in the Obsidian Recursive Notes exporter.
+"""
+
+import os
+import re
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+# Import the modules to test
+from obsidian_recursive_notes.path_utils import (
+    build_file_index, clear_export_dir, create_export_dir, ensure_str_path, find_file_cached, find_file_in_directory, sanitize_filename
+)
+
+
+class TestEnsureStrPath(unittest.TestCase):
+    """Test cases for path conversion"""
+
+    def test_path_types_convert_to_str(self):
+        """Test that str, bytes and Path inputs all give the same string"""
+        expected = os.path.join("vault", "note.md")
+        for path in [expected, os.fsencode(expected), Path(expected)]:
+            with self.subTest(path=path):
+                self.assertEqual(ensure_str_path(path), expected)
+        self.assertIsNone(ensure_str_path(None))
+
+
+class TestSanitizeFilename(unittest.TestCase):
+    """Test cases for filename sanitization"""
+
+    def test_matches_character_class(self):
+        """Test that only characters outside [a-zA-Z0-9._-] are replaced"""
+        pattern = re.compile(r'[^a-zA-Z0-9._-]')
+        for filename in ["plain-name_1.md", "My Note (draft).md", "Ünïcødé ñote.md", "tab\there/slash.md", "emoji 📝.md"]:
+            with self.subTest(filename=filename):
+                self.assertEqual(sanitize_filename(filename), pattern.sub('_', filename))
+
+
+class TestFileLookup(unittest.TestCase):
+    """Test cases for file lookup logic"""
+
+    def setUp(self):
+        """Set up a small directory tree"""
+        self.test_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.test_dir, "a", "deep"), exist_ok=True)
+        os.makedirs(os.path.join(self.test_dir, "b"), exist_ok=True)
+
+        for rel_path in ["top.md", "a/deep/nested.md", "b/nested.md", "b/other.md"]:
+            with open(os.path.join(self.test_dir, rel_path.replace("/", os.sep)), "w") as f:
+                f.write("# Test\n")
+
+    def tearDown(self):
+        """Clean up temporary test files"""
+        shutil.rmtree(self.test_dir)
+
+    def test_build_file_index(self):
+        """Test that every file is indexed under its filename"""
+        file_index = build_file_index(self.test_dir)
+
+        self.assertEqual(file_index["top.md"], [os.path.join(self.test_dir, "top.md")])
+        self.assertEqual(len(file_index["nested.md"]), 2)
+        self.assertNotIn("deep", file_index)
+
+    def test_indexed_lookup_matches_walk(self):
+        """Test that lookups through the index agree with the os.walk search"""
+        file_index = {}
+        for filename in ["top.md", "nested.md", "other.md", "missing.md", "b/other.md"]:
+            self.assertEqual(
+                find_file_in_directory(filename, self.test_dir, file_index),
+                find_file_in_directory(filename, self.test_dir),
+                f"Lookup of {filename} should not depend on the index"
+            )
+
+        # The tree should only have been walked once
+        self.assertEqual(list(file_index), [self.test_dir])
+
+    def test_indexed_lookup_normalizes_directory(self):
+        """Test that unnormalized spellings of a directory find the same files through the index"""
+        file_index = {}
+        find_file_in_directory("top.md", self.test_dir, file_index)
+        
+        for base_directory in [os.path.join(self.test_dir, "a", "."), os.path.join(self.test_dir, "a", "deep", "..")]:
+            with self.subTest(base_directory=base_directory):
+                self.assertEqual(
+                    find_file_in_directory("nested.md", base_directory, file_index),
+                    os.path.join(self.test_dir, "a", "deep", "nested.md")
+                )
+                self.assertEqual(
+                    find_file_in_directory("nested.md", base_directory, file_index),
+                    find_file_in_directory("nested.md", base_directory)
+                )
+
+    def test_subdirectory_index_derived_from_ancestor(self):
+        """Test that a subdirectory's index is taken from an already indexed ancestor"""
+        file_index = {}
+        find_file_in_directory("nested.md", self.test_dir, file_index)
+
+        sub_directory = os.path.join(self.test_dir, "b")
+        self.assertEqual(
+            find_file_in_directory("nested.md", os.path.join(self.test_dir, "a"), file_index),
+            os.path.join(self.test_dir, "a", "deep", "nested.md")
+        )
+        self.assertIsNone(find_file_in_directory("top.md", sub_directory, file_index))
+        self.assertEqual(file_index[sub_directory], build_file_index(sub_directory))
+
+    def test_indexed_lookup_needs_no_stat(self):
+        """Test that files found in the index are resolved without touching the filesystem"""
+        file_index = {}
+        find_file_in_directory("missing.md", self.test_dir, file_index)
+
+        with mock.patch("os.path.exists", wraps=os.path.exists) as exists:
+            self.assertEqual(
+                find_file_in_directory("top.md", self.test_dir, file_index),
+                os.path.join(self.test_dir, "top.md")
+            )
+            self.assertEqual(
+                find_file_in_directory("other.md", self.test_dir, file_index),
+                os.path.join(self.test_dir, "b", "other.md")
+            )
+            exists.assert_not_called()
+
+    def test_cached_lookup_remembers_hits_and_misses(self):
+        """Test that find_file_cached looks each (filename, directory) pair up once"""
+        file_index, lookup_cache = {}, {}
+        with mock.patch("obsidian_recursive_notes.path_utils.find_file_in_directory",
+                        wraps=find_file_in_directory) as find_file:
+            for _ in range(2):
+                self.assertEqual(
+                    find_file_cached("other.md", self.test_dir, file_index, lookup_cache),
+                    os.path.join(self.test_dir, "b", "other.md")
+                )
+                self.assertIsNone(find_file_cached("missing.md", self.test_dir, file_index, lookup_cache))
+        
+        self.assertEqual(find_file.call_count, 2)
+        self.assertEqual(lookup_cache[("missing.md", self.test_dir)], None)
+
+
+class TestClearExportDir(unittest.TestCase):
+    """Test cases for clearing a previous export"""
+
+    def setUp(self):
+        """Set up a directory holding a previous export"""
+        self.test_dir = tempfile.mkdtemp()
+        self.export_dir = os.path.join(self.test_dir, "export")
+        os.makedirs(os.path.join(self.export_dir, "notes"))
+        with open(os.path.join(self.export_dir, "notes", "old.md"), "w") as f:
+            f.write("# Old\n")
+
+    def tearDown(self):
+        """Clean up temporary test files"""
+        shutil.rmtree(self.test_dir)
+
+    def test_previous_export_is_removed(self):
+        """Test that the old files are gone and an empty notes directory is left"""
+        deletion = clear_export_dir(self.export_dir)
+        self.assertEqual(os.listdir(os.path.join(self.export_dir, "notes")), [])
+
+        # The renamed-aside copy disappears once the background deletion finishes
+        deletion.join()
+        self.assertEqual(os.listdir(self.test_dir), ["export"])
+
+    def test_fresh_export_dir_is_left_alone(self):
+        """Test that a directory just made by create_export_dir starts no deletion"""
+        fresh_dir = create_export_dir(os.path.join(self.test_dir, "fresh.md"), base_dir=self.test_dir)
+        self.assertIsNone(clear_export_dir(fresh_dir))
+        self.assertEqual(sorted(os.listdir(self.test_dir)), ["export", "fresh"])
+        self.assertEqual(os.listdir(fresh_dir), ["notes"])
+
+    def test_missing_export_dir_is_created(self):
+        """Test that a fresh export directory is created when there is nothing to clear"""
+        fresh_dir = os.path.join(self.test_dir, "fresh")
+        self.assertIsNone(clear_export_dir(fresh_dir))
+        self.assertTrue(os.path.isdir(os.path.join(fresh_dir, "notes")))
+
+
+if __name__ == "__main__":
+    unittest.main()